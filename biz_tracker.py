@@ -8,9 +8,26 @@
 import requests
 import re
 import json
+import heapq
+import os
 from datetime import datetime
-from collections import defaultdict
-from html import escape
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import ahocorasick  # pyahocorasick：C 实现的多模式匹配，可选加速
+except ImportError:
+    ahocorasick = None
+
+try:
+    import ijson  # 流式 JSON 解析，可选：边下载边解析，不整页载入内存
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # Rust 实现的 JSON 解析，可选：整体解析时比 stdlib 快 2-3 倍
+except ImportError:
+    orjson = None
 
 # ── 币种词典 ──────────────────────────────────────────────────────
 COINS = {
@@ -64,200 +81,297 @@ ALIASES = {
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; CryptoTracker/1.0)",
     "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
 }
 
+# 复用连接池 + 显式声明压缩：catalog.json gzip 后能小 5-10 倍
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+
+# 热帖记录：比每条一个 dict 省内存，字段访问也更快
+HotThread = namedtuple("HotThread", "no sub coins replies")
+
+# 前三名的奖牌标记，行循环里直接按下标取
+_RANK_LABELS = ("①", "②", "③")
+_RANK_CLASSES = ("top1", "top2", "top3")
+
+# HTML 转义表：translate 一次 C 层扫描，替代 html.escape 的多次 replace
+_ESC_TABLE = str.maketrans({
+    "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;",
+})
+
+
+def escape(s: str) -> str:
+    """等价于 html.escape(s)，用预建转换表单趟完成"""
+    return s.translate(_ESC_TABLE)
+
+# 预编译正则：所有别名合并成一个交替模式，每个帖子只扫一遍
+_TAG_RE = re.compile(r'<[^>]+>')
+# 退回路径的正则：别名表本身就是小写，扫小写副本即可，不需要 IGNORECASE。
+# 交替分支按长度降序冻结成常量，保证长词不被同前缀的短词抢先匹配
+_ALIAS_PATTERN = '|'.join(sorted((re.escape(a) for a in ALIASES), key=len, reverse=True))
+_SYM_PATTERN = '|'.join(sorted(map(re.escape, COINS), key=len, reverse=True))
+_ALIAS_RE = re.compile(r'\b(' + _ALIAS_PATTERN + r')\b')
+_COIN_SYM_RE = re.compile(r'\b(' + _SYM_PATTERN + r')\b')
+
+# Aho–Corasick 自动机：所有关键词一次线性扫描，匹配逻辑在 C 层
+if ahocorasick is not None:
+    _SYM_AC = ahocorasick.Automaton()
+    for _sym in COINS:
+        _SYM_AC.add_word(_sym, _sym)
+    _SYM_AC.make_automaton()
+
+    _ALIAS_AC = ahocorasick.Automaton()
+    for _alias, _sym in ALIASES.items():
+        _ALIAS_AC.add_word(_alias, (len(_alias), _sym))
+    _ALIAS_AC.make_automaton()
+
+
+def _word_bounded(s: str, start: int, end: int) -> bool:
+    """等价于正则 \\b：匹配两侧不能是字母数字或下划线"""
+    if start > 0:
+        c = s[start - 1]
+        if c.isalnum() or c == '_':
+            return False
+    if end < len(s):
+        c = s[end]
+        if c.isalnum() or c == '_':
+            return False
+    return True
+
+
 def extract_coins(text: str) -> list[str]:
     """从文本中提取所有提及的币种 symbol"""
     if not text:
         return []
+    # 纯数字/符号的帖子（贴图、价格串）直接跳过，不进正则
+    if not any(c.isalpha() for c in text[:64]):
+        return []
     found = set()
-    clean = re.sub(r'<[^>]+>', ' ', text)  # 去掉 HTML 标签
+    # 没有 '<' 就不用跑去标签的正则（省一次扫描和一份拷贝）
+    clean = _TAG_RE.sub(' ', text) if '<' in text else text
+    lower = clean.lower()           # 小写副本只做一次，两条路径共用
+    # symbol 全是大写：文本里没有大写字母时整个 symbol 扫描都可以跳过
+    has_upper = clean != lower
+
+    if ahocorasick is not None:
+        # symbol 扫原文（区分大小写），别名扫小写副本
+        if has_upper:
+            for end, sym in _SYM_AC.iter(clean):
+                if _word_bounded(clean, end - len(sym) + 1, end + 1):
+                    found.add(sym)
+        for end, (alen, sym) in _ALIAS_AC.iter(lower):
+            if _word_bounded(lower, end - alen + 1, end + 1):
+                found.add(sym)
+    else:
+        # 没装 pyahocorasick 时退回正则
+        if has_upper:
+            found.update(_COIN_SYM_RE.findall(clean))
+        for alias in _ALIAS_RE.findall(lower):
+            found.add(ALIASES[alias])
+
+    return list(found)
 
-    # 别名匹配
-    lower = clean.lower()
-    for alias, sym in ALIASES.items():
-        if re.search(r'\b' + re.escape(alias) + r'\b', lower):
-            found.add(sym)
 
-    # 大写 symbol 匹配（2-8个字母）
-    for word in re.findall(r'\b[A-Z]{2,8}\b', clean):
-        if word in COINS:
-            found.add(word)
+# 条件请求缓存：meta 存 ETag/Last-Modified，body 存上次响应体（304 时复用）
+_CACHE_META = ".biz_tracker_cache.json"
+_CACHE_BODY = ".biz_tracker_cache.body"
 
-    return list(found)
 
+class _TeeReader:
+    """边读边把响应体写进缓存文件，不打断流式解析"""
+
+    def __init__(self, raw, sink):
+        self._raw = raw
+        self._sink = sink
+
+    def read(self, size=-1):
+        chunk = self._raw.read(size)
+        if chunk:
+            self._sink.write(chunk)
+        return chunk
+
+
+def _iter_catalog_body(f):
+    """从响应体（文件对象）里逐个产出帖子"""
+    if ijson is not None:
+        yield from ijson.items(f, "item.threads.item")
+        return
+    # 整体解析路径：优先 orjson，退回 stdlib json
+    catalog = orjson.loads(f.read()) if orjson is not None else json.load(f)
+    for page in catalog:
+        yield from page.get("threads", [])
 
-def fetch_catalog() -> list[dict]:
-    """抓取 /biz/ catalog"""
+
+def fetch_catalog():
+    """流式抓取 /biz/ catalog，逐个产出帖子；内容没变时直接复用本地缓存"""
     print("📡 正在抓取 4chan /biz/ catalog...")
     url = "https://a.4cdn.org/biz/catalog.json"
-    resp = requests.get(url, headers=HEADERS, timeout=20)
-    resp.raise_for_status()
-    catalog = resp.json()
-    threads = []
-    for page in catalog:
-        threads.extend(page.get("threads", []))
-    print(f"   获取到 {len(threads)} 个帖子")
-    return threads
 
+    cond_headers = {}
+    if os.path.exists(_CACHE_BODY):
+        try:
+            with open(_CACHE_META, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("etag"):
+                cond_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                cond_headers["If-Modified-Since"] = meta["last_modified"]
+        except (OSError, ValueError):
+            pass
+
+    resp = _SESSION.get(url, timeout=20, stream=True, headers=cond_headers)
+    if resp.status_code == 304:
+        print("   内容未变化（304），使用本地缓存")
+        with open(_CACHE_BODY, "rb") as f:
+            yield from _iter_catalog_body(f)
+        return
+    resp.raise_for_status()
 
-def analyze(threads: list[dict]) -> tuple[dict, list[dict]]:
-    """分析帖子，返回 (coin_counts, hot_threads)"""
-    coin_counts = defaultdict(lambda: {"count": 0, "threads": []})
+    # 边下载边解析，同时把响应体落盘供下次 304 复用
+    resp.raw.decode_content = True
+    with open(_CACHE_BODY, "wb") as sink:
+        yield from _iter_catalog_body(_TeeReader(resp.raw, sink))
+    with open(_CACHE_META, "w", encoding="utf-8") as f:
+        json.dump({
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+        }, f)
+
+
+def _scan_thread(t: dict):
+    """进程池 worker：只做纯 CPU 的文本扫描，聚合留在主进程"""
+    sub = t.get("sub")
+    com = t.get("com")
+    if not sub and not com:
+        return None
+    coins = extract_coins((sub or "") + " " + (com or ""))
+    if not coins:
+        return None
+    return t.get("no"), coins, t.get("replies", 0), sub, com
+
+
+def _scan_results(threads, parallel: bool):
+    """把帖子流映射成扫描结果流，可选进程池绕过 GIL"""
+    if parallel:
+        with ProcessPoolExecutor() as pool:
+            yield from pool.map(_scan_thread, threads, chunksize=64)
+    else:
+        yield from map(_scan_thread, threads)
+
+
+def analyze(threads, parallel: bool = True) -> tuple[Counter, dict, list, int]:
+    """分析帖子流，返回 (coin_counts, coin_threads, hot_threads, thread_count)"""
+    # SoA 拆分：计数走 Counter，帖子 id 列表单独存
+    coin_counts = Counter()
+    coin_threads = defaultdict(list)
     hot_threads = []
+    thread_count = 0
 
-    for t in threads:
-        text = " ".join([
-            t.get("sub", "") or "",
-            t.get("com", "") or "",
-        ])
-        coins = extract_coins(text)
+    for res in _scan_results(threads, parallel):
+        thread_count += 1
+        if res is None:
+            continue
+        no, coins, replies, sub, com = res
+
+        coin_counts.update(coins)
         for sym in coins:
-            coin_counts[sym]["count"] += 1
-            coin_counts[sym]["threads"].append(t.get("no"))
+            coin_threads[sym].append(no)
 
-        if coins:
-            hot_threads.append({
-                "no": t.get("no"),
-                "sub": t.get("sub") or (t.get("com") or "")[:80],
-                "coins": coins,
-                "replies": t.get("replies", 0),
-            })
+        # 固定大小的最小堆只留回复数前 10，O(N log 10)，不攒全量再排序
+        entry = (replies, no, sub, com, coins)
+        if len(hot_threads) < 10:
+            heapq.heappush(hot_threads, entry)
+        elif entry > hot_threads[0]:
+            heapq.heapreplace(hot_threads, entry)
 
-    hot_threads.sort(key=lambda x: x["replies"], reverse=True)
-    return dict(coin_counts), hot_threads[:10]
+    # 标题兜底（取 com 前 80 字符）只对最终留下的 10 条做
+    top = [
+        HotThread(no, sub or (com or "")[:80], coins, replies)
+        for replies, no, sub, com, coins in sorted(hot_threads, reverse=True)
+    ]
+    return coin_counts, dict(coin_threads), top, thread_count
 
 
-def generate_html(coin_counts: dict, hot_threads: list, thread_count: int) -> str:
-    """生成 HTML 报告"""
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    sorted_coins = sorted(coin_counts.items(), key=lambda x: x[1]["count"], reverse=True)
-    total_mentions = sum(v["count"] for v in coin_counts.values())
-    max_count = sorted_coins[0][1]["count"] if sorted_coins else 1
-    top10 = sorted_coins[:10]
-
-    # 生成排行榜行
-    rows_html = ""
-    for i, (sym, data) in enumerate(sorted_coins):
-        count = data["count"]
-        pct = count / total_mentions * 100 if total_mentions else 0
-        bar_w = count / max_count * 100
-        rank_labels = {0: "①", 1: "②", 2: "③"}
-        rank_text = rank_labels.get(i, f"#{i+1}")
-        rank_class = {0: "top1", 1: "top2", 2: "top3"}.get(i, "")
-        full_name = COINS.get(sym, "")
-        rows_html += f"""
-        <div class="coin-row" style="animation-delay:{i*0.03}s">
-          <div class="rank {rank_class}">{rank_text}</div>
-          <div class="coin-name">
-            <div>
-              <div class="coin-symbol">{escape(sym)}</div>
-              <div class="coin-full">{escape(full_name)}</div>
-            </div>
-          </div>
-          <div class="coin-count">{count}</div>
-          <div class="coin-bar-wrap">
-            <div class="coin-bar-bg"><div class="coin-bar" style="width:{bar_w:.1f}%"></div></div>
-          </div>
-          <div class="coin-pct">{pct:.1f}%</div>
-        </div>"""
+# 静态样式表：普通字符串常量，不走 f-string 格式化（也省掉 {{ }} 转义）
+_STYLE = """<style>
+@import url('https://fonts.googleapis.com/css2?family=Share+Tech+Mono&family=Teko:wght@300;400;500&display=swap');
+:root{--bg:#0a0a0a;--panel:#111;--border:#1e1e1e;--border2:#2a2a2a;--green:#00ff41;--green2:#00cc33;--amber:#ffb000;--red:#ff3030;--text:#c8ffc8;--muted:#2a5a2a;--white:#e8ffe8;}
+*{margin:0;padding:0;box-sizing:border-box;}
+body{background:var(--bg);color:var(--text);font-family:'Share Tech Mono',monospace;min-height:100vh;}
+body::before{content:'';position:fixed;inset:0;background:repeating-linear-gradient(0deg,transparent,transparent 2px,rgba(0,255,65,0.015) 2px,rgba(0,255,65,0.015) 4px);pointer-events:none;z-index:9999;}
+body::after{content:'';position:fixed;inset:0;background-image:linear-gradient(rgba(0,255,65,0.03) 1px,transparent 1px),linear-gradient(90deg,rgba(0,255,65,0.03) 1px,transparent 1px);background-size:32px 32px;pointer-events:none;z-index:0;}
+.wrap{position:relative;z-index:1;max-width:1100px;margin:0 auto;padding:24px 20px 60px;}
+header{border-bottom:1px solid var(--border2);padding-bottom:18px;margin-bottom:24px;display:flex;align-items:flex-end;justify-content:space-between;flex-wrap:wrap;gap:12px;}
+.logo{font-family:'Teko',sans-serif;font-size:42px;font-weight:400;color:var(--green);line-height:1;letter-spacing:2px;text-shadow:0 0 20px rgba(0,255,65,0.5);}
+.logo span{color:var(--amber);}
+.subtitle{font-size:11px;color:var(--muted);letter-spacing:2px;text-transform:uppercase;margin-top:4px;}
+.meta{text-align:right;font-size:11px;color:var(--muted);line-height:1.8;}
+.meta strong{color:var(--green);}
+.stats-row{display:grid;grid-template-columns:repeat(4,1fr);gap:10px;margin-bottom:20px;}
+.sc{background:var(--panel);border:1px solid var(--border);padding:14px;position:relative;overflow:hidden;}
+.sc::before{content:'';position:absolute;top:0;left:0;right:0;height:1px;background:var(--green);opacity:.3;}
+.sl{font-size:9px;letter-spacing:2px;text-transform:uppercase;color:var(--muted);margin-bottom:6px;}
+.sv{font-family:'Teko',sans-serif;font-size:28px;color:var(--green);line-height:1;}
+.ss{font-size:10px;color:var(--muted);margin-top:3px;}
+.sv.amber{color:var(--amber);font-size:20px;}
+.main-layout{display:grid;grid-template-columns:1fr 300px;gap:16px;}
+.board-header{display:grid;grid-template-columns:40px 1fr 90px 80px 70px;padding:8px 14px;font-size:9px;letter-spacing:2px;text-transform:uppercase;color:var(--muted);border-bottom:1px solid var(--border2);margin-bottom:4px;}
+.coin-row{display:grid;grid-template-columns:40px 1fr 90px 80px 70px;padding:10px 14px;border:1px solid transparent;transition:all .15s;animation:rowIn .3s ease both;}
+@keyframes rowIn{from{opacity:0;transform:translateX(-8px)}to{opacity:1;transform:translateX(0)}}
+.coin-row:hover{background:rgba(0,255,65,.03);border-color:var(--border);}
+.rank{font-size:11px;color:var(--muted);display:flex;align-items:center;}
+.rank.top1{color:var(--amber);text-shadow:0 0 8px rgba(255,176,0,.6);}
+.rank.top2{color:#c0c0c0;}.rank.top3{color:#cd7f32;}
+.coin-name{display:flex;align-items:center;gap:10px;}
+.coin-symbol{font-family:'Teko',sans-serif;font-size:20px;color:var(--white);letter-spacing:1px;}
+.coin-full{font-size:10px;color:var(--muted);margin-top:1px;}
+.coin-count{font-family:'Teko',sans-serif;font-size:22px;color:var(--green);display:flex;align-items:center;text-shadow:0 0 8px rgba(0,255,65,.3);}
+.coin-bar-wrap{display:flex;align-items:center;padding:0 8px;}
+.coin-bar-bg{width:100%;height:4px;background:var(--border);border-radius:2px;overflow:hidden;}
+.coin-bar{height:100%;background:linear-gradient(90deg,var(--green2),var(--green));border-radius:2px;box-shadow:0 0 6px rgba(0,255,65,.4);}
+.coin-pct{font-size:11px;color:var(--muted);display:flex;align-items:center;justify-content:flex-end;}
+.sidebar{display:flex;flex-direction:column;gap:14px;}
+.side-card{background:var(--panel);border:1px solid var(--border);padding:16px;}
+.side-title{font-size:9px;letter-spacing:2px;text-transform:uppercase;color:var(--muted);margin-bottom:14px;padding-bottom:8px;border-bottom:1px solid var(--border);}
+.hm-row{display:flex;align-items:center;gap:8px;margin-bottom:5px;}
+.hm-label{font-size:10px;color:var(--muted);width:44px;text-align:right;flex-shrink:0;}
+.hm-bar{flex:1;height:14px;background:var(--border);border-radius:1px;overflow:hidden;}
+.hm-fill{height:100%;border-radius:1px;}
+.hm-count{font-size:9px;color:var(--muted);width:28px;flex-shrink:0;}
+.thread-item{padding:9px 0;border-bottom:1px solid var(--border);font-size:11px;line-height:1.5;}
+.thread-item:last-child{border-bottom:none;}
+.th-coins{display:flex;gap:4px;flex-wrap:wrap;margin-bottom:4px;}
+.th-tag{font-size:9px;padding:1px 6px;background:rgba(0,255,65,.07);border:1px solid rgba(0,255,65,.2);color:var(--green);letter-spacing:1px;}
+.th-sub a{color:var(--text);text-decoration:none;}
+.th-sub a:hover{color:var(--green);}
+.th-meta{font-size:10px;color:var(--muted);margin-top:3px;}
+.footer{margin-top:30px;padding-top:16px;border-top:1px solid var(--border);font-size:10px;color:var(--muted);text-align:center;letter-spacing:2px;}
+@media(max-width:800px){.main-layout{grid-template-columns:1fr;}.stats-row{grid-template-columns:repeat(2,1fr);}.coin-row,.board-header{grid-template-columns:36px 1fr 70px 60px;}.coin-pct{display:none;}}
+</style>
+"""
 
-    # 热度图
-    heatmap_html = ""
-    heat_colors = ["#00ff41","#00e838","#00d030","#00b828","#00a020",
-                   "#008818","#007010","#005808","#004000","#002800"]
-    hm_max = top10[0][1]["count"] if top10 else 1
-    for i, (sym, data) in enumerate(top10):
-        w = data["count"] / hm_max * 100
-        color = heat_colors[min(i, len(heat_colors)-1)]
-        heatmap_html += f"""
-        <div class="hm-row">
-          <div class="hm-label">{escape(sym)}</div>
-          <div class="hm-bar">
-            <div class="hm-fill" style="width:{w:.1f}%;background:{color};box-shadow:0 0 4px {color}40"></div>
-          </div>
-          <div class="hm-count">{data['count']}</div>
-        </div>"""
 
-    # 热帖列表
-    threads_html = ""
-    for t in hot_threads:
-        tags = "".join(f'<span class="th-tag">{escape(c)}</span>' for c in t["coins"][:4])
-        sub = escape(str(t["sub"])[:70])
-        threads_html += f"""
-        <div class="thread-item">
-          <div class="th-coins">{tags}</div>
-          <div class="th-sub">
-            <a href="https://boards.4chan.org/biz/thread/{t['no']}" target="_blank">{sub}</a>
-          </div>
-          <div class="th-meta">{t['replies']} replies · #{t['no']}</div>
-        </div>"""
+def iter_html(coin_counts: Counter, hot_threads: list, thread_count: int):
+    """逐块生成 HTML 报告，避免在内存里拼一个完整的大字符串"""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    sorted_coins = coin_counts.most_common()
+    total_mentions = sum(coin_counts.values())
+    max_count = sorted_coins[0][1] if sorted_coins else 1
+    top10 = sorted_coins[:10]
 
     top_sym = sorted_coins[0][0] if sorted_coins else "—"
-    top_cnt = sorted_coins[0][1]["count"] if sorted_coins else 0
+    top_cnt = sorted_coins[0][1] if sorted_coins else 0
 
-    return f"""<!DOCTYPE html>
+    yield f"""<!DOCTYPE html>
 <html lang="zh">
 <head>
 <meta charset="UTF-8">
 <meta name="viewport" content="width=device-width,initial-scale=1.0">
 <title>/biz/ Crypto Tracker · {now}</title>
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Share+Tech+Mono&family=Teko:wght@300;400;500&display=swap');
-:root{{--bg:#0a0a0a;--panel:#111;--border:#1e1e1e;--border2:#2a2a2a;--green:#00ff41;--green2:#00cc33;--amber:#ffb000;--red:#ff3030;--text:#c8ffc8;--muted:#2a5a2a;--white:#e8ffe8;}}
-*{{margin:0;padding:0;box-sizing:border-box;}}
-body{{background:var(--bg);color:var(--text);font-family:'Share Tech Mono',monospace;min-height:100vh;}}
-body::before{{content:'';position:fixed;inset:0;background:repeating-linear-gradient(0deg,transparent,transparent 2px,rgba(0,255,65,0.015) 2px,rgba(0,255,65,0.015) 4px);pointer-events:none;z-index:9999;}}
-body::after{{content:'';position:fixed;inset:0;background-image:linear-gradient(rgba(0,255,65,0.03) 1px,transparent 1px),linear-gradient(90deg,rgba(0,255,65,0.03) 1px,transparent 1px);background-size:32px 32px;pointer-events:none;z-index:0;}}
-.wrap{{position:relative;z-index:1;max-width:1100px;margin:0 auto;padding:24px 20px 60px;}}
-header{{border-bottom:1px solid var(--border2);padding-bottom:18px;margin-bottom:24px;display:flex;align-items:flex-end;justify-content:space-between;flex-wrap:wrap;gap:12px;}}
-.logo{{font-family:'Teko',sans-serif;font-size:42px;font-weight:400;color:var(--green);line-height:1;letter-spacing:2px;text-shadow:0 0 20px rgba(0,255,65,0.5);}}
-.logo span{{color:var(--amber);}}
-.subtitle{{font-size:11px;color:var(--muted);letter-spacing:2px;text-transform:uppercase;margin-top:4px;}}
-.meta{{text-align:right;font-size:11px;color:var(--muted);line-height:1.8;}}
-.meta strong{{color:var(--green);}}
-.stats-row{{display:grid;grid-template-columns:repeat(4,1fr);gap:10px;margin-bottom:20px;}}
-.sc{{background:var(--panel);border:1px solid var(--border);padding:14px;position:relative;overflow:hidden;}}
-.sc::before{{content:'';position:absolute;top:0;left:0;right:0;height:1px;background:var(--green);opacity:.3;}}
-.sl{{font-size:9px;letter-spacing:2px;text-transform:uppercase;color:var(--muted);margin-bottom:6px;}}
-.sv{{font-family:'Teko',sans-serif;font-size:28px;color:var(--green);line-height:1;}}
-.ss{{font-size:10px;color:var(--muted);margin-top:3px;}}
-.sv.amber{{color:var(--amber);font-size:20px;}}
-.main-layout{{display:grid;grid-template-columns:1fr 300px;gap:16px;}}
-.board-header{{display:grid;grid-template-columns:40px 1fr 90px 80px 70px;padding:8px 14px;font-size:9px;letter-spacing:2px;text-transform:uppercase;color:var(--muted);border-bottom:1px solid var(--border2);margin-bottom:4px;}}
-.coin-row{{display:grid;grid-template-columns:40px 1fr 90px 80px 70px;padding:10px 14px;border:1px solid transparent;transition:all .15s;animation:rowIn .3s ease both;}}
-@keyframes rowIn{{from{{opacity:0;transform:translateX(-8px)}}to{{opacity:1;transform:translateX(0)}}}}
-.coin-row:hover{{background:rgba(0,255,65,.03);border-color:var(--border);}}
-.rank{{font-size:11px;color:var(--muted);display:flex;align-items:center;}}
-.rank.top1{{color:var(--amber);text-shadow:0 0 8px rgba(255,176,0,.6);}}
-.rank.top2{{color:#c0c0c0;}}.rank.top3{{color:#cd7f32;}}
-.coin-name{{display:flex;align-items:center;gap:10px;}}
-.coin-symbol{{font-family:'Teko',sans-serif;font-size:20px;color:var(--white);letter-spacing:1px;}}
-.coin-full{{font-size:10px;color:var(--muted);margin-top:1px;}}
-.coin-count{{font-family:'Teko',sans-serif;font-size:22px;color:var(--green);display:flex;align-items:center;text-shadow:0 0 8px rgba(0,255,65,.3);}}
-.coin-bar-wrap{{display:flex;align-items:center;padding:0 8px;}}
-.coin-bar-bg{{width:100%;height:4px;background:var(--border);border-radius:2px;overflow:hidden;}}
-.coin-bar{{height:100%;background:linear-gradient(90deg,var(--green2),var(--green));border-radius:2px;box-shadow:0 0 6px rgba(0,255,65,.4);}}
-.coin-pct{{font-size:11px;color:var(--muted);display:flex;align-items:center;justify-content:flex-end;}}
-.sidebar{{display:flex;flex-direction:column;gap:14px;}}
-.side-card{{background:var(--panel);border:1px solid var(--border);padding:16px;}}
-.side-title{{font-size:9px;letter-spacing:2px;text-transform:uppercase;color:var(--muted);margin-bottom:14px;padding-bottom:8px;border-bottom:1px solid var(--border);}}
-.hm-row{{display:flex;align-items:center;gap:8px;margin-bottom:5px;}}
-.hm-label{{font-size:10px;color:var(--muted);width:44px;text-align:right;flex-shrink:0;}}
-.hm-bar{{flex:1;height:14px;background:var(--border);border-radius:1px;overflow:hidden;}}
-.hm-fill{{height:100%;border-radius:1px;}}
-.hm-count{{font-size:9px;color:var(--muted);width:28px;flex-shrink:0;}}
-.thread-item{{padding:9px 0;border-bottom:1px solid var(--border);font-size:11px;line-height:1.5;}}
-.thread-item:last-child{{border-bottom:none;}}
-.th-coins{{display:flex;gap:4px;flex-wrap:wrap;margin-bottom:4px;}}
-.th-tag{{font-size:9px;padding:1px 6px;background:rgba(0,255,65,.07);border:1px solid rgba(0,255,65,.2);color:var(--green);letter-spacing:1px;}}
-.th-sub a{{color:var(--text);text-decoration:none;}}
-.th-sub a:hover{{color:var(--green);}}
-.th-meta{{font-size:10px;color:var(--muted);margin-top:3px;}}
-.footer{{margin-top:30px;padding-top:16px;border-top:1px solid var(--border);font-size:10px;color:var(--muted);text-align:center;letter-spacing:2px;}}
-@media(max-width:800px){{.main-layout{{grid-template-columns:1fr;}}.stats-row{{grid-template-columns:repeat(2,1fr);}}.coin-row,.board-header{{grid-template-columns:36px 1fr 70px 60px;}}.coin-pct{{display:none;}}}}
-</style>
-</head>
+"""
+    yield _STYLE
+    yield f"""</head>
 <body>
 <div class="wrap">
   <header>
@@ -283,17 +397,73 @@ header{{border-bottom:1px solid var(--border2);padding-bottom:18px;margin-bottom
     <div class="leaderboard">
       <div class="board-header">
         <div>#</div><div>币种</div><div>提及数</div><div>分布</div><div>占比</div>
-      </div>
-      {rows_html}
+      </div>"""
+
+    # 排行榜行
+    for i, (sym, count) in enumerate(sorted_coins):
+        pct = count / total_mentions * 100 if total_mentions else 0
+        bar_w = count / max_count * 100
+        rank_text = _RANK_LABELS[i] if i < 3 else f"#{i+1}"
+        rank_class = _RANK_CLASSES[i] if i < 3 else ""
+        full_name = COINS.get(sym, "")
+        yield f"""
+        <div class="coin-row" style="animation-delay:{i*0.03}s">
+          <div class="rank {rank_class}">{rank_text}</div>
+          <div class="coin-name">
+            <div>
+              <div class="coin-symbol">{escape(sym)}</div>
+              <div class="coin-full">{escape(full_name)}</div>
+            </div>
+          </div>
+          <div class="coin-count">{count}</div>
+          <div class="coin-bar-wrap">
+            <div class="coin-bar-bg"><div class="coin-bar" style="width:{bar_w:.1f}%"></div></div>
+          </div>
+          <div class="coin-pct">{pct:.1f}%</div>
+        </div>"""
+
+    yield """
     </div>
     <div class="sidebar">
       <div class="side-card">
         <div class="side-title">Top 10 热度图</div>
-        <div class="heatmap">{heatmap_html}</div>
+        <div class="heatmap">"""
+
+    # 热度图
+    heat_colors = ["#00ff41","#00e838","#00d030","#00b828","#00a020",
+                   "#008818","#007010","#005808","#004000","#002800"]
+    hm_max = top10[0][1] if top10 else 1
+    for i, (sym, count) in enumerate(top10):
+        w = count / hm_max * 100
+        color = heat_colors[min(i, len(heat_colors)-1)]
+        yield f"""
+        <div class="hm-row">
+          <div class="hm-label">{escape(sym)}</div>
+          <div class="hm-bar">
+            <div class="hm-fill" style="width:{w:.1f}%;background:{color};box-shadow:0 0 4px {color}40"></div>
+          </div>
+          <div class="hm-count">{count}</div>
+        </div>"""
+
+    yield """</div>
       </div>
       <div class="side-card">
-        <div class="side-title">相关热帖（按回复数）</div>
-        {threads_html}
+        <div class="side-title">相关热帖（按回复数）</div>"""
+
+    # 热帖列表
+    for t in hot_threads:
+        tags = "".join(f'<span class="th-tag">{escape(c)}</span>' for c in t.coins[:4])
+        sub = escape(str(t.sub)[:70])
+        yield f"""
+        <div class="thread-item">
+          <div class="th-coins">{tags}</div>
+          <div class="th-sub">
+            <a href="https://boards.4chan.org/biz/thread/{t.no}" target="_blank">{sub}</a>
+          </div>
+          <div class="th-meta">{t.replies} replies · #{t.no}</div>
+        </div>"""
+
+    yield f"""
       </div>
     </div>
   </div>
@@ -312,28 +482,25 @@ def main():
     print("=" * 50)
 
     try:
-        threads = fetch_catalog()
-        print("🔍 分析帖子...")
-        coin_counts, hot_threads = analyze(threads)
+        coin_counts, coin_threads, hot_threads, thread_count = analyze(fetch_catalog())
+        print(f"🔍 已分析 {thread_count} 个帖子")
 
         if not coin_counts:
             print("⚠ 未识别到任何币种提及")
             return
 
         # 打印排行榜到终端
-        print(f"\n📊 识别到 {len(coin_counts)} 种币，共 {sum(v['count'] for v in coin_counts.values())} 次提及\n")
+        print(f"\n📊 识别到 {len(coin_counts)} 种币，共 {sum(coin_counts.values())} 次提及\n")
         print(f"{'排名':<6} {'符号':<8} {'全名':<22} {'提及数':>6}")
         print("-" * 46)
-        sorted_coins = sorted(coin_counts.items(), key=lambda x: x[1]["count"], reverse=True)
-        for i, (sym, data) in enumerate(sorted_coins[:20], 1):
-            bar = "█" * min(data["count"], 30)
-            print(f"  #{i:<4} {sym:<8} {COINS.get(sym,''):<22} {data['count']:>4}  {bar}")
+        for i, (sym, count) in enumerate(coin_counts.most_common(20), 1):
+            bar = "█" * min(count, 30)
+            print(f"  #{i:<4} {sym:<8} {COINS.get(sym,''):<22} {count:>4}  {bar}")
 
-        # 生成 HTML
+        # 生成 HTML（流式写入，不在内存里拼整页）
         output_file = "index.html"
-        html = generate_html(coin_counts, hot_threads, len(threads))
         with open(output_file, "w", encoding="utf-8") as f:
-            f.write(html)
+            f.writelines(iter_html(coin_counts, hot_threads, thread_count))
 
         print(f"\n✅ 报告已生成：{output_file}")
 